@@ -0,0 +1,98 @@
+import { test } from "node:test";
+import assert from "node:assert/strict";
+import { AnalyticsAggregator, toStats, type DecisionCounts } from "./analytics";
+
+const HOUR_MS = 60 * 60 * 1000;
+const NOW = Date.UTC(2025, 0, 15, 10, 30);
+const DECISIONS = ["Yes", "No", "Partial", "Unknown"];
+const DOCUMENTS = ["doc-a", "doc-b", "doc-c", undefined];
+
+interface Sample {
+  decision: string;
+  createdAt: Date;
+  documentId?: string;
+}
+
+// Deterministic pseudo-random history spread over the last 60 days
+function sampleHistory(count: number): Sample[] {
+  let seed = 42;
+  const next = () => {
+    seed = (seed * 1103515245 + 12345) % 2147483648;
+    return seed / 2147483648;
+  };
+
+  return Array.from({ length: count }, () => ({
+    decision: DECISIONS[Math.floor(next() * DECISIONS.length)],
+    createdAt: new Date(NOW - Math.floor(next() * 60 * 24 * HOUR_MS)),
+    documentId: DOCUMENTS[Math.floor(next() * DOCUMENTS.length)],
+  }));
+}
+
+function bruteForce(samples: Sample[]): DecisionCounts {
+  return {
+    totalAnalyses: samples.length,
+    approvedClaims: samples.filter(s => s.decision === "Yes").length,
+    partialClaims: samples.filter(s => s.decision === "Partial").length,
+    rejectedClaims: samples.filter(s => s.decision === "No").length,
+  };
+}
+
+function build(samples: Sample[]): AnalyticsAggregator {
+  const aggregator = new AnalyticsAggregator(() => NOW);
+  for (const sample of samples) {
+    aggregator.record(sample, sample.documentId);
+  }
+  return aggregator;
+}
+
+const history = sampleHistory(2000);
+
+test("summary matches a full count, including analyses without a document", () => {
+  assert.deepEqual(build(history).getSummary(), toStats(bruteForce(history)));
+});
+
+test("toStats computes the approval rate from approved and partial decisions", () => {
+  const stats = toStats({ totalAnalyses: 3, approvedClaims: 1, partialClaims: 1, rejectedClaims: 1 });
+  assert.equal(stats.approvalRate, 66.7);
+  assert.equal(toStats({ totalAnalyses: 0, approvedClaims: 0, partialClaims: 0, rejectedClaims: 0 }).approvalRate, 0);
+});
+
+test("windows match a full count since the reported start", () => {
+  const aggregator = build(history);
+
+  for (const hours of [1, 5, 24, 72, 24 * 30]) {
+    const window = aggregator.getWindow(hours);
+    const since = new Date(window.since).getTime();
+
+    assert.ok(since <= NOW - hours * HOUR_MS, `window of ${hours}h starts too late`);
+    assert.ok(since > NOW - (hours + 1) * HOUR_MS, `window of ${hours}h starts too early`);
+
+    const inWindow = history.filter(s => s.createdAt.getTime() >= since);
+    const { hours: _hours, since: _since, ...stats } = window;
+    assert.deepEqual(stats, toStats(bruteForce(inWindow)));
+  }
+});
+
+test("windows are clamped to the hourly retention", () => {
+  assert.equal(build(history).getWindow(10_000).hours, 24 * 30);
+});
+
+test("daily rollup matches a full count per UTC day", () => {
+  const rollup = build(history).getDailyRollup(60);
+
+  assert.equal(rollup.length, 60);
+  assert.equal(rollup[rollup.length - 1].date, "2025-01-15");
+  for (const { date, ...stats } of rollup) {
+    const onDay = history.filter(s => s.createdAt.toISOString().slice(0, 10) === date);
+    assert.deepEqual(stats, toStats(bruteForce(onDay)));
+  }
+});
+
+test("document breakdown matches a full count per document", () => {
+  const breakdown = build(history).getDocumentBreakdown();
+
+  assert.deepEqual(breakdown.map(b => b.documentId).sort(), ["doc-a", "doc-b", "doc-c"]);
+  for (const { documentId, ...stats } of breakdown) {
+    assert.deepEqual(stats, toStats(bruteForce(history.filter(s => s.documentId === documentId))));
+  }
+});
@@ -0,0 +1,141 @@
+import { type Analysis } from "@shared/schema";
+
+const HOUR_MS = 60 * 60 * 1000;
+// Hourly buckets back windowed queries; older hours only survive in the daily rollup.
+// One extra bucket so a 30-day window can still include the partial oldest hour.
+const MAX_WINDOW_HOURS = 24 * 30;
+const HOURLY_RETENTION = MAX_WINDOW_HOURS + 1;
+
+export interface DecisionCounts {
+  totalAnalyses: number;
+  approvedClaims: number;
+  partialClaims: number;
+  rejectedClaims: number;
+}
+
+export interface AnalysisStats extends DecisionCounts {
+  pendingClaims: number;
+  approvalRate: number;
+}
+
+function emptyCounts(): DecisionCounts {
+  return { totalAnalyses: 0, approvedClaims: 0, partialClaims: 0, rejectedClaims: 0 };
+}
+
+function addDecision(counts: DecisionCounts, decision: string) {
+  counts.totalAnalyses++;
+  if (decision === "Yes") counts.approvedClaims++;
+  else if (decision === "Partial") counts.partialClaims++;
+  else if (decision === "No") counts.rejectedClaims++;
+}
+
+function mergeCounts(target: DecisionCounts, source: DecisionCounts) {
+  target.totalAnalyses += source.totalAnalyses;
+  target.approvedClaims += source.approvedClaims;
+  target.partialClaims += source.partialClaims;
+  target.rejectedClaims += source.rejectedClaims;
+}
+
+export function toStats(counts: DecisionCounts): AnalysisStats {
+  const { totalAnalyses, approvedClaims, partialClaims } = counts;
+  const approvalRate = totalAnalyses > 0 ? ((approvedClaims + partialClaims) / totalAnalyses) * 100 : 0;
+
+  return {
+    ...counts,
+    pendingClaims: 0, // Since we don't have pending status in our simple model
+    approvalRate: Math.round(approvalRate * 10) / 10,
+  };
+}
+
+function dayKey(date: Date): string {
+  return date.toISOString().slice(0, 10);
+}
+
+/**
+ * Decision counters and time-bucketed rollups, updated as analyses are written
+ * so dashboard queries never rescan the analysis history.
+ */
+export class AnalyticsAggregator {
+  private totals = emptyCounts();
+  private byDocument = new Map<string, DecisionCounts>();
+  private byDay = new Map<string, DecisionCounts>();
+  private byHour = new Map<number, DecisionCounts>();
+
+  constructor(private now: () => number = Date.now) {}
+
+  // documentId is optional: an analysis whose claim can't be found still counts
+  // towards the totals and time buckets, just not towards any document.
+  record(analysis: Pick<Analysis, "decision" | "createdAt">, documentId?: string) {
+    const createdAt = new Date(analysis.createdAt);
+    const hour = Math.floor(createdAt.getTime() / HOUR_MS);
+
+    addDecision(this.totals, analysis.decision);
+    if (documentId) addDecision(this.bucket(this.byDocument, documentId), analysis.decision);
+    addDecision(this.bucket(this.byDay, dayKey(createdAt)), analysis.decision);
+    if (hour > this.currentHour() - HOURLY_RETENTION) {
+      addDecision(this.bucket(this.byHour, hour), analysis.decision);
+      this.pruneHours();
+    }
+  }
+
+  getSummary(): AnalysisStats {
+    return toStats(this.totals);
+  }
+
+  // Counts are kept per clock hour, so the window starts at the beginning of the
+  // hour containing now - hours: it covers at least `hours` and less than one
+  // extra hour. `since` reports the exact start. Cost depends on the window
+  // length, not on how many analyses fall inside it.
+  getWindow(hours: number): AnalysisStats & { hours: number; since: string } {
+    const span = Math.min(Math.max(Math.floor(hours), 1), MAX_WINDOW_HOURS);
+    const firstHour = Math.floor((this.now() - span * HOUR_MS) / HOUR_MS);
+    const counts = emptyCounts();
+
+    for (let hour = firstHour; hour <= this.currentHour(); hour++) {
+      const bucket = this.byHour.get(hour);
+      if (bucket) mergeCounts(counts, bucket);
+    }
+    return { hours: span, since: new Date(firstHour * HOUR_MS).toISOString(), ...toStats(counts) };
+  }
+
+  getDocumentBreakdown(): Array<AnalysisStats & { documentId: string }> {
+    return Array.from(this.byDocument.entries()).map(([documentId, counts]) => ({
+      documentId,
+      ...toStats(counts),
+    }));
+  }
+
+  getDailyRollup(days: number): Array<AnalysisStats & { date: string }> {
+    const span = Math.max(Math.floor(days), 1);
+    const today = this.now();
+    const rollup: Array<AnalysisStats & { date: string }> = [];
+
+    for (let offset = span - 1; offset >= 0; offset--) {
+      const date = dayKey(new Date(today - offset * 24 * HOUR_MS));
+      rollup.push({ date, ...toStats(this.byDay.get(date) || emptyCounts()) });
+    }
+    return rollup;
+  }
+
+  private bucket<K>(buckets: Map<K, DecisionCounts>, key: K): DecisionCounts {
+    let counts = buckets.get(key);
+    if (!counts) {
+      counts = emptyCounts();
+      buckets.set(key, counts);
+    }
+    return counts;
+  }
+
+  private currentHour(): number {
+    return Math.floor(this.now() / HOUR_MS);
+  }
+
+  private pruneHours() {
+    if (this.byHour.size <= HOURLY_RETENTION) return;
+
+    const oldest = this.currentHour() - HOURLY_RETENTION;
+    for (const hour of Array.from(this.byHour.keys())) {
+      if (hour <= oldest) this.byHour.delete(hour);
+    }
+  }
+}
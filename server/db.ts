@@ -0,0 +1,98 @@
+import type { BetterSQLite3Database } from "drizzle-orm/better-sqlite3";
+import { createRequire } from "module";
+import path from "path";
+import fs from "fs";
+import * as schema from "@shared/sqliteSchema";
+
+// better-sqlite3 is declared as an optional dependency because its native build can
+// fail on some platforms. It is only loaded when SQLITE_PATH is set, so installs and
+// serverless deployments work without it.
+const require = createRequire(import.meta.url);
+
+export type LocalDatabase = BetterSQLite3Database<typeof schema>;
+
+// Tables are created on startup rather than through drizzle-kit so the app
+// works out of the box without a migration step. Keep in sync with
+// shared/sqliteSchema.ts; storage.test.ts compares the created tables, indexes
+// and foreign keys against the drizzle definitions.
+const bootstrapSql = `
+CREATE TABLE IF NOT EXISTS documents (
+  id TEXT PRIMARY KEY NOT NULL,
+  filename TEXT NOT NULL,
+  original_name TEXT NOT NULL,
+  file_size INTEGER NOT NULL,
+  file_path TEXT NOT NULL,
+  uploaded_at INTEGER NOT NULL,
+  processed_at INTEGER,
+  status TEXT DEFAULT 'uploaded' NOT NULL,
+  sections TEXT
+);
+CREATE INDEX IF NOT EXISTS documents_uploaded_at_idx ON documents (uploaded_at);
+
+CREATE TABLE IF NOT EXISTS claims (
+  id TEXT PRIMARY KEY NOT NULL,
+  document_id TEXT NOT NULL REFERENCES documents(id),
+  patient_age INTEGER NOT NULL,
+  gender TEXT NOT NULL,
+  procedure TEXT NOT NULL,
+  location TEXT,
+  distance REAL,
+  policy_duration INTEGER,
+  claim_amount REAL,
+  reimbursement_percentage INTEGER DEFAULT 100,
+  created_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS claims_document_id_created_at_idx ON claims (document_id, created_at);
+CREATE INDEX IF NOT EXISTS claims_created_at_idx ON claims (created_at);
+
+CREATE TABLE IF NOT EXISTS analyses (
+  id TEXT PRIMARY KEY NOT NULL,
+  claim_id TEXT NOT NULL REFERENCES claims(id),
+  decision TEXT NOT NULL,
+  approved_amount TEXT,
+  justification TEXT NOT NULL,
+  relevant_clauses TEXT,
+  ai_response TEXT,
+  created_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS analyses_claim_id_created_at_idx ON analyses (claim_id, created_at);
+CREATE INDEX IF NOT EXISTS analyses_created_at_idx ON analyses (created_at);
+`;
+
+// Local embedded database, so extracted sections and analyses survive restarts
+// and PDFs don't need to be re-processed. Needs a writable filesystem, which
+// rules out Vercel serverless.
+export function openDatabase(filename: string): LocalDatabase {
+  let Database;
+  let drizzle;
+  try {
+    Database = require("better-sqlite3");
+    ({ drizzle } = require("drizzle-orm/better-sqlite3"));
+  } catch (error) {
+    throw new Error(
+      `SQLITE_PATH is set but better-sqlite3 could not be loaded (${error}). ` +
+      "Its optional native build may have failed during npm install; reinstall it or " +
+      "unset SQLITE_PATH to use in-memory storage."
+    );
+  }
+
+  let sqlite;
+  try {
+    if (filename !== ":memory:") {
+      fs.mkdirSync(path.dirname(path.resolve(filename)), { recursive: true });
+    }
+    sqlite = new Database(filename);
+  } catch (error) {
+    throw new Error(
+      `Could not open SQLite database at ${filename} (${error}). ` +
+      "SQLite storage needs a writable filesystem; unset SQLITE_PATH to use in-memory storage."
+    );
+  }
+
+  sqlite.pragma("journal_mode = WAL");
+  sqlite.pragma("synchronous = NORMAL");
+  sqlite.pragma("foreign_keys = ON");
+  sqlite.exec(bootstrapSql);
+
+  return drizzle(sqlite, { schema });
+}
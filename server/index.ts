@@ -1,11 +1,9 @@
-import dotenv from "dotenv";
+// Load environment variables before any module reads process.env at import time
+import "dotenv/config";
 import express, { type Request, Response, NextFunction } from "express";
 import { registerRoutes } from "./routes";
 import { setupVite, serveStatic, log } from "./vite";
 
-// Load environment variables
-dotenv.config();
-
 const app = express();
 app.use(express.json());
 app.use(express.urlencoded({ extended: false }));
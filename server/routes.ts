@@ -1,11 +1,11 @@
 import type { Express } from "express";
 import { createServer, type Server } from "http";
 import { storage } from "./storage";
-import { insertDocumentSchema, insertClaimSchema, insertAnalysisSchema } from "@shared/schema";
+import { insertDocumentSchema, insertClaimSchema, insertAnalysisSchema, type Analysis, type Claim } from "@shared/schema";
 import multer from "multer";
 import path from "path";
 import fs from "fs";
-import { analyzeClaim, processPDF, type AnalysisResult } from "./services/pythonService";
+import { analyzeClaim, analyzeClaims, processPDF, type AnalysisResult } from "./services/pythonService";
 
 // Configure multer for file uploads
 const uploadsDir = path.join(process.cwd(), 'uploads');
@@ -27,6 +27,11 @@ const upload = multer({
   },
 });
 
+// Per-query state in bulk analysis: either a claim with its analysis result,
+// or the error that stopped the query before a claim was created
+type AnalyzedQuery = { index: number; query: string; claim: Claim; analysisResult: AnalysisResult };
+type FailedQuery = { index: number; query: string; error: string };
+
 export async function registerRoutes(app: Express): Promise<Server> {
   // Upload PDF document
   app.post("/api/documents/upload", upload.single('pdf'), async (req, res) => {
@@ -142,8 +147,15 @@ export async function registerRoutes(app: Express): Promise<Server> {
         return res.status(500).json({ message: "Perplexity API key not configured" });
       }
       
-      // Process all queries in parallel
-      const analysisPromises = queries.map(async (query: string, index: number) => {
+      // Analyze all queries in one batch. Near-duplicate queries are grouped so each
+      // unique query runs retrieval and the AI call once, fanned out to every member.
+      const analysisResults = await analyzeClaims(queries, document.filePath, apiKey)
+        .catch((error): AnalysisResult[] => {
+          console.error("Bulk analysis error:", error);
+          return queries.map(() => ({ error: `Processing failed: ${error}` }));
+        });
+      
+      const outcomes = await Promise.all(queries.map(async (query: string, index: number): Promise<AnalyzedQuery | FailedQuery> => {
         try {
           // Create claim for each query
           const claimData = {
@@ -160,50 +172,75 @@ export async function registerRoutes(app: Express): Promise<Server> {
           
           const claim = await storage.createClaim(claimData);
           
-          // Analyze the claim
-          const analysisResult: AnalysisResult = await analyzeClaim(query, document.filePath, apiKey);
-          
-          if (analysisResult.error) {
-            return {
-              queryIndex: index,
-              query: query,
-              error: analysisResult.error,
-              claimId: claim.id
-            };
-          }
-          
-          // Save analysis result
-          const analysis = await storage.createAnalysis({
-            claimId: claim.id,
-            decision: analysisResult.decision?.decision || "Unknown",
-            approvedAmount: analysisResult.decision?.amount || "Not specified",
-            justification: analysisResult.decision?.justification || "No justification provided",
-            relevantClauses: analysisResult.top_clauses || [],
-            aiResponse: analysisResult.ai_response || {},
-          });
-          
-          return {
-            queryIndex: index,
-            query: query,
-            claimId: claim.id,
-            analysis: analysis,
-            sections: analysisResult.sections,
-            topClauses: analysisResult.top_clauses,
-          };
+          return { index, query, claim, analysisResult: analysisResults[index] };
         } catch (error) {
           console.error(`Error processing query ${index}:`, error);
+          return { index, query, error: `Processing failed: ${error}` };
+        }
+      }));
+      
+      // Save every successful analysis in a single batch write
+      const successful = outcomes.filter((outcome): outcome is AnalyzedQuery =>
+        "claim" in outcome && !outcome.analysisResult.error
+      );
+      const newAnalyses = successful.map(({ claim, analysisResult }) => ({
+        claimId: claim.id,
+        decision: analysisResult.decision?.decision || "Unknown",
+        approvedAmount: analysisResult.decision?.amount || "Not specified",
+        justification: analysisResult.decision?.justification || "No justification provided",
+        relevantClauses: analysisResult.top_clauses || [],
+        aiResponse: analysisResult.ai_response || {},
+      }));
+      
+      let savedAnalyses: (Analysis | undefined)[];
+      const saveErrors = new Map<number, string>();
+      try {
+        savedAnalyses = await storage.createAnalyses(newAnalyses);
+      } catch (error) {
+        // createAnalyses is all-or-nothing, so nothing was saved and each analysis can
+        // be retried on its own; a bad row then only fails its own query
+        console.error("Bulk save error, retrying analyses individually:", error);
+        savedAnalyses = await Promise.all(newAnalyses.map((newAnalysis, i) =>
+          storage.createAnalysis(newAnalysis).catch((saveError) => {
+            console.error(`Error saving analysis for query ${successful[i].index}:`, saveError);
+            saveErrors.set(successful[i].index, `Failed to save analysis: ${saveError}`);
+            return undefined;
+          })
+        ));
+      }
+      const analysisByIndex = new Map(successful.map((outcome, i) => [outcome.index, savedAnalyses[i]]));
+      
+      const results = outcomes.map((outcome) => {
+        if ("error" in outcome) {
+          return {
+            queryIndex: outcome.index,
+            query: outcome.query,
+            error: outcome.error,
+            claimId: null
+          };
+        }
+        
+        const { index, query, claim, analysisResult } = outcome;
+        const error = analysisResult.error || saveErrors.get(index);
+        if (error) {
           return {
             queryIndex: index,
             query: query,
-            error: `Processing failed: ${error}`,
-            claimId: null
+            error: error,
+            claimId: claim.id
           };
         }
+        
+        return {
+          queryIndex: index,
+          query: query,
+          claimId: claim.id,
+          analysis: analysisByIndex.get(index),
+          sections: analysisResult.sections,
+          topClauses: analysisResult.top_clauses,
+        };
       });
       
-      // Wait for all analyses to complete
-      const results = await Promise.all(analysisPromises);
-      
       res.json({
         success: true,
         totalQueries: queries.length,
@@ -308,25 +345,42 @@ export async function registerRoutes(app: Express): Promise<Server> {
   // Get statistics
   app.get("/api/stats", async (req, res) => {
     try {
-      const analyses = await storage.getAllAnalyses();
-      const totalAnalyses = analyses.length;
-      const approvedClaims = analyses.filter(a => a.decision === "Yes").length;
-      const partialClaims = analyses.filter(a => a.decision === "Partial").length;
-      const rejectedClaims = analyses.filter(a => a.decision === "No").length;
-      const pendingClaims = 0; // Since we don't have pending status in our simple model
+      res.json(storage.analytics.getSummary());
+    } catch (error) {
+      console.error("Get stats error:", error);
+      res.status(500).json({ message: "Failed to get statistics" });
+    }
+  });
+
+  // Get statistics for a trailing window, e.g. approval rate over the last 24h.
+  // Windows use hourly buckets; the response's `since` is the exact start.
+  app.get("/api/stats/window", async (req, res) => {
+    try {
+      const hours = parseInt(req.query.hours as string) || 24;
+      res.json(storage.analytics.getWindow(hours));
+    } catch (error) {
+      console.error("Get windowed stats error:", error);
+      res.status(500).json({ message: "Failed to get statistics" });
+    }
+  });
 
-      const approvalRate = totalAnalyses > 0 ? ((approvedClaims + partialClaims) / totalAnalyses) * 100 : 0;
+  // Get statistics broken down per policy document
+  app.get("/api/stats/documents", async (req, res) => {
+    try {
+      res.json(storage.analytics.getDocumentBreakdown());
+    } catch (error) {
+      console.error("Get document stats error:", error);
+      res.status(500).json({ message: "Failed to get statistics" });
+    }
+  });
 
-      res.json({
-        totalAnalyses,
-        approvedClaims,
-        partialClaims,
-        rejectedClaims,
-        pendingClaims,
-        approvalRate: Math.round(approvalRate * 10) / 10,
-      });
+  // Get per-day decision rollup
+  app.get("/api/stats/daily", async (req, res) => {
+    try {
+      const days = parseInt(req.query.days as string) || 7;
+      res.json(storage.analytics.getDailyRollup(Math.min(days, 365)));
     } catch (error) {
-      console.error("Get stats error:", error);
+      console.error("Get daily stats error:", error);
       res.status(500).json({ message: "Failed to get statistics" });
     }
   });
@@ -8,7 +8,14 @@ import fitz
 import sys
 import random
 import hashlib
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
+
+# Seconds to wait for the Perplexity API before failing the claim
+REQUEST_TIMEOUT_SECONDS = 60
+
+# Query groups analyzed in parallel within one batch
+MAX_CONCURRENT_GROUPS = 8
 
 def is_title(line: str) -> bool:
     """
@@ -99,6 +106,27 @@ def extract_structured_sections(pdf_path: str) -> List[Dict[str, Any]]:
     doc.close()
     return [clause for clause in structured_data if len(clause['text']) > 50]
 
+KNOWN_LOCATIONS = [
+    'mumbai', 'delhi', 'new delhi', 'bangalore', 'bengaluru', 'hyderabad', 'chennai',
+    'kolkata', 'pune', 'ahmedabad', 'jaipur', 'lucknow', 'kanpur', 'nagpur', 'indore',
+    'bhopal', 'patna', 'surat', 'vadodara', 'chandigarh', 'kochi', 'coimbatore',
+    'visakhapatnam', 'thane', 'noida', 'gurgaon', 'gurugram', 'goa'
+]
+
+# Words that don't change what a claim is about. Every other token, including all
+# numbers, locations and procedure or body-part words, must match exactly before
+# two queries can be treated as the same claim.
+FILLER_WORDS = {
+    'a', 'an', 'the', 'in', 'at', 'on', 'of', 'for', 'to', 'from', 'and', 'with',
+    'is', 'are', 'was', 'were', 'be', 'been', 'am', 'i', 'we', 'he', 'she', 'they',
+    'it', 'me', 'my', 'his', 'her', 'their', 'our', 'its', 'this', 'that', 'these',
+    'those', 'who', 'which', 'has', 'have', 'had', 'do', 'does', 'did', 'will',
+    'would', 'can', 'could', 'should', 'please', 'kindly', 'check', 'whether',
+    'claim', 'claims', 'request', 'requesting', 'patient', 'person', 'insured',
+    'member', 'covered', 'cover', 'coverage', 'eligible', 'old', 'aged', 'get',
+    'got', 'undergo', 'underwent', 'undergoing', 'done'
+}
+
 def extract_query_entities(query: str) -> Dict[str, Any]:
     """
     Extract key entities from natural language query
@@ -111,7 +139,8 @@ def extract_query_entities(query: str) -> Dict[str, Any]:
         'gender': None,
         'location': None,
         'amount': None,
-        'urgency': None
+        'urgency': None,
+        'policy_duration_months': None
     }
     
     # Medical procedures and treatments
@@ -153,6 +182,18 @@ def extract_query_entities(query: str) -> Dict[str, Any]:
             entities['urgency'] = term
             break
     
+    # Extract location
+    for city in KNOWN_LOCATIONS:
+        if re.search(r'\b' + city + r'\b', query_lower):
+            entities['location'] = city
+            break
+    
+    # Extract policy duration, e.g. "3-month policy" or "2 year old policy"
+    duration_match = re.search(r'(\d+)[-\s]?(month|mon|year|yr)s?[-\s]?(?:old\s+)?(?:policy|insurance|cover)', query_lower)
+    if duration_match:
+        months = int(duration_match.group(1))
+        entities['policy_duration_months'] = months * 12 if duration_match.group(2) in ('year', 'yr') else months
+    
     # Extract amount
     amount_match = re.search(r'(?:rs\.?|₹|inr)[\s]*([0-9,]+)|([0-9,]+)[\s]*(?:rs\.?|₹|inr)', query_lower)
     if amount_match:
@@ -160,6 +201,75 @@ def extract_query_entities(query: str) -> Dict[str, Any]:
     
     return entities
 
+def normalize_query(query: str) -> str:
+    """
+    Canonicalize case, whitespace, currency and number formatting so that
+    trivially different phrasings of the same claim compare equal.
+    """
+    text = query.lower()
+
+    # Drop thousands separators, but only in valid Indian (1,50,000) or Western
+    # (150,000) groupings so comma-separated lists like "25,30" stay apart
+    text = re.sub(r'(?<![\d,])\d{1,3}(?:(?:,\d{2})*,\d{3}|(?:,\d{3})+)(?![\d,])',
+                  lambda m: m.group(0).replace(',', ''), text)
+
+    # Expand k / lakh shorthands (+0.5 rounds away float error, e.g. 1.15 lakh)
+    text = re.sub(r'(\d+(?:\.\d+)?)\s*k\b', lambda m: str(int(float(m.group(1)) * 1000 + 0.5)), text)
+    text = re.sub(r'(\d+(?:\.\d+)?)\s*(?:lakhs?|lacs?)\b', lambda m: str(int(float(m.group(1)) * 100000 + 0.5)), text)
+
+    # Single spelling for the currency marker and time units
+    text = re.sub(r'₹|\binr\b|\brs\b\.?', ' rs ', text)
+    text = re.sub(r'\b(?:years|yrs|yr)\b', 'year', text)
+    text = re.sub(r'\b(?:months|mos)\b', 'month', text)
+
+    # Strip punctuation, keeping decimal points inside numbers
+    text = re.sub(r'[^\w\s.]', ' ', text)
+    text = re.sub(r'(?<!\d)\.|\.(?!\d)', ' ', text)
+
+    return ' '.join(text.split())
+
+def query_signature(normalized_query: str) -> Tuple[Any, ...]:
+    """
+    Hashable key for near-duplicate detection: the extracted entities plus
+    every token that isn't a filler word. Queries with equal signatures ask
+    the same question.
+    """
+    entities = extract_query_entities(normalized_query)
+    tokens = set(normalized_query.split())
+    tokens.update(entities['medical_procedures'])
+    tokens.update(entities['conditions'])
+
+    return (
+        entities['age'],
+        entities['gender'],
+        entities['location'],
+        entities['amount'],
+        entities['urgency'],
+        entities['policy_duration_months'],
+        frozenset(entities['medical_procedures']),
+        frozenset(entities['conditions']),
+        frozenset(token for token in tokens if token not in FILLER_WORDS),
+    )
+
+def group_similar_queries(queries: List[str]) -> List[List[int]]:
+    """
+    Group queries that are exact repeats after normalization, or that differ
+    only in filler words: extracted entities and every non-filler token must
+    match exactly. Returns groups of indexes into `queries`, in first-seen
+    order.
+    """
+    groups: List[List[int]] = []
+    by_signature: Dict[Tuple[Any, ...], int] = {}
+
+    for index, query in enumerate(queries):
+        signature = query_signature(normalize_query(query))
+        if signature not in by_signature:
+            by_signature[signature] = len(groups)
+            groups.append([])
+        groups[by_signature[signature]].append(index)
+
+    return groups
+
 def get_top_similar_clauses(query: str, indexed_data: List[Dict], k: int = 5) -> List[Dict]:
     """
     Enhanced clause matching with better natural language understanding
@@ -277,11 +387,13 @@ def get_top_similar_clauses(query: str, indexed_data: List[Dict], k: int = 5) ->
     
     return meaningful_results
 
-def analyze_claim(query: str, pdf_path: str, api_key: str) -> Dict[str, Any]:
+def analyze_claim(query: str, pdf_path: str, api_key: str,
+                  structured_clauses: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
     """Main function to analyze a claim"""
     try:
-        # Extract sections from PDF
-        structured_clauses = extract_structured_sections(pdf_path)
+        # Extract sections from PDF unless the caller already has them
+        if structured_clauses is None:
+            structured_clauses = extract_structured_sections(pdf_path)
         
         if not structured_clauses:
             # For demo purposes, return a mock analysis when no sections are found
@@ -468,7 +580,7 @@ IMPORTANT GUIDELINES:
         if api_key == "your_perplexity_api_key_here" or not api_key or api_key == "test_api_key":
             return generate_mock_response(query, entities, top_clauses)
         
-        response = requests.post(url, headers=headers, data=json.dumps(payload))
+        response = requests.post(url, headers=headers, data=json.dumps(payload), timeout=REQUEST_TIMEOUT_SECONDS)
         
         if response.status_code == 200:
             ai_response = response.json()
@@ -499,7 +611,42 @@ IMPORTANT GUIDELINES:
     except Exception as e:
         return {"error": f"Processing error: {str(e)}"}
 
+def analyze_claims(queries: List[str], pdf_path: str, api_key: str) -> List[Dict[str, Any]]:
+    """
+    Analyze a batch of claims against one policy. The PDF is parsed once and
+    each group of near-duplicate queries runs retrieval and the AI call once,
+    with the result fanned out to every query in the group. Groups run
+    concurrently, since each is dominated by the API round trip.
+    """
+    if not queries:
+        return []
+
+    try:
+        structured_clauses = extract_structured_sections(pdf_path)
+    except Exception as e:
+        return [{"error": f"Processing error: {str(e)}"} for _ in queries]
+
+    groups = group_similar_queries(queries)
+    with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_GROUPS, len(groups))) as executor:
+        group_results = list(executor.map(
+            lambda group: analyze_claim(queries[group[0]], pdf_path, api_key, structured_clauses),
+            groups
+        ))
+
+    results: List[Dict[str, Any]] = [{} for _ in queries]
+    for group, shared in zip(groups, group_results):
+        for index in group:
+            results[index] = {**shared, "query": queries[index]} if "error" not in shared else shared
+
+    return results
+
 if __name__ == "__main__":
+    # Batch mode: queries are passed as a JSON array on stdin
+    if len(sys.argv) == 4 and sys.argv[1] == "--batch":
+        queries = json.load(sys.stdin)
+        print(json.dumps(analyze_claims(queries, sys.argv[2], sys.argv[3])))
+        sys.exit(0)
+
     if len(sys.argv) != 4:
         print(json.dumps({"error": "Usage: python pdfProcessor.py <query> <pdf_path> <api_key>"}))
         sys.exit(1)
@@ -0,0 +1,19 @@
+import { test } from "node:test";
+import assert from "node:assert/strict";
+import fs from "fs";
+import { normalizeQuery } from "./pythonService";
+
+// Shared with test_pdfProcessor.py so both normalizers agree
+const cases: [string, string][] = JSON.parse(
+  fs.readFileSync(new URL("./query_normalization_cases.json", import.meta.url), "utf-8")
+);
+
+test("normalizeQuery matches the Python normalize_query cases", () => {
+  for (const [query, expected] of cases) {
+    assert.equal(normalizeQuery(query), expected, `normalizing ${JSON.stringify(query)}`);
+  }
+});
+
+test("differently formatted amounts share a single-flight key", () => {
+  assert.equal(normalizeQuery("Knee surgery Rs 50,000"), normalizeQuery("knee surgery rs 50000"));
+});
@@ -15,7 +15,99 @@ export interface AnalysisResult {
   error?: string;
 }
 
+// In-flight analyses keyed by document and normalized query. Concurrent identical
+// requests share one Python run instead of each spawning their own.
+const inFlight = new Map<string, Promise<unknown>>();
+
+function singleFlight<T>(key: string, run: () => Promise<T>): Promise<T> {
+  const existing = inFlight.get(key);
+  if (existing) return existing as Promise<T>;
+
+  const promise = run().finally(() => inFlight.delete(key));
+  inFlight.set(key, promise);
+  return promise;
+}
+
+// Port of normalize_query in pdfProcessor.py, so single-claim coalescing treats the
+// same queries as equal as the batch grouping does. Both implementations are
+// checked against query_normalization_cases.json; change them together.
+export function normalizeQuery(query: string): string {
+  let text = query.toLowerCase();
+
+  // Drop thousands separators, but only in valid Indian (1,50,000) or Western
+  // (150,000) groupings so comma-separated lists like "25,30" stay apart
+  text = text.replace(/(?<![\d,])\d{1,3}(?:(?:,\d{2})*,\d{3}|(?:,\d{3})+)(?![\d,])/g, (match) => match.replace(/,/g, ''));
+
+  // Expand k / lakh shorthands (+0.5 rounds away float error, e.g. 1.15 lakh)
+  text = text.replace(/(\d+(?:\.\d+)?)\s*k\b/g, (_, amount) => String(Math.floor(parseFloat(amount) * 1000 + 0.5)));
+  text = text.replace(/(\d+(?:\.\d+)?)\s*(?:lakhs?|lacs?)\b/g, (_, amount) => String(Math.floor(parseFloat(amount) * 100000 + 0.5)));
+
+  // Single spelling for the currency marker and time units
+  text = text.replace(/₹|\binr\b|\brs\b\.?/g, ' rs ');
+  text = text.replace(/\b(?:years|yrs|yr)\b/g, 'year');
+  text = text.replace(/\b(?:months|mos)\b/g, 'month');
+
+  // Strip punctuation, keeping decimal points inside numbers
+  text = text.replace(/[^\p{L}\p{N}_\s.]/gu, ' ');
+  text = text.replace(/(?<!\d)\.|\.(?!\d)/g, ' ');
+
+  return text.split(/\s+/).filter(Boolean).join(' ');
+}
+
 export async function analyzeClaim(query: string, pdfPath: string, apiKey: string): Promise<AnalysisResult> {
+  const key = `claim:${pdfPath}:${normalizeQuery(query)}`;
+  const result = await singleFlight(key, () => runAnalyzeClaim(query, pdfPath, apiKey));
+  return { ...result, query };
+}
+
+// Analyze several queries against one document in a single Python run. Near-duplicate
+// queries are grouped there, so each group hits retrieval and the AI API only once.
+export async function analyzeClaims(queries: string[], pdfPath: string, apiKey: string): Promise<AnalysisResult[]> {
+  const key = `batch:${pdfPath}:${JSON.stringify(queries.map(normalizeQuery))}`;
+  const results = await singleFlight(key, () => runAnalyzeClaims(queries, pdfPath, apiKey));
+  return results.map((result, index) => ({ ...result, query: queries[index] }));
+}
+
+function runAnalyzeClaims(queries: string[], pdfPath: string, apiKey: string): Promise<AnalysisResult[]> {
+  return new Promise((resolve, reject) => {
+    const pythonScript = path.join(process.cwd(), 'server/services/pdfProcessor.py');
+    const pythonProcess = spawn('python', [pythonScript, '--batch', pdfPath, apiKey]);
+    
+    let stdout = '';
+    let stderr = '';
+    
+    pythonProcess.stdout.on('data', (data) => {
+      stdout += data.toString();
+    });
+    
+    pythonProcess.stderr.on('data', (data) => {
+      stderr += data.toString();
+    });
+    
+    pythonProcess.on('close', (code) => {
+      if (code !== 0) {
+        reject(new Error(`Python process exited with code ${code}: ${stderr}`));
+        return;
+      }
+      
+      try {
+        const results = JSON.parse(stdout);
+        resolve(results);
+      } catch (error) {
+        reject(new Error(`Failed to parse Python output: ${error}`));
+      }
+    });
+    
+    pythonProcess.on('error', (error) => {
+      reject(new Error(`Failed to start Python process: ${error}`));
+    });
+    
+    pythonProcess.stdin.write(JSON.stringify(queries));
+    pythonProcess.stdin.end();
+  });
+}
+
+function runAnalyzeClaim(query: string, pdfPath: string, apiKey: string): Promise<AnalysisResult> {
   return new Promise((resolve, reject) => {
     const pythonScript = path.join(process.cwd(), 'server/services/pdfProcessor.py');
     const pythonProcess = spawn('python', [pythonScript, query, pdfPath, apiKey]);
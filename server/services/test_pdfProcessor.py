@@ -0,0 +1,70 @@
+import json
+import os
+import sys
+
+import pytest
+
+# pdfProcessor imports the PDF and HTTP libraries at module level
+pytest.importorskip("fitz")
+pytest.importorskip("requests")
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from pdfProcessor import group_similar_queries, normalize_query  # noqa: E402
+
+LONG_QUERY = (
+    "46 year old male patient with a {duration}-month policy requesting {joint} "
+    "replacement surgery at a network hospital in {city} for Rs 2,50,000 after a fall"
+)
+
+
+# Shared with pythonService.test.ts so the TypeScript port stays in sync
+with open(os.path.join(os.path.dirname(__file__), "query_normalization_cases.json"), encoding="utf-8") as f:
+    NORMALIZATION_CASES = json.load(f)
+
+
+@pytest.mark.parametrize("query, expected", NORMALIZATION_CASES)
+def test_normalize_query(query, expected):
+    assert normalize_query(query) == expected
+
+
+def test_groups_exact_repeats_and_filler_only_differences():
+    queries = [
+        "46-year-old male, knee surgery in Pune, Rs. 1,50,000",
+        "46 yrs old male knee surgery pune rs 150000",
+        "Dental treatment after accident",
+        "dental   treatment AFTER accident",
+    ]
+    assert group_similar_queries(queries) == [[0, 1], [2, 3]]
+
+
+def test_distinct_long_claims_are_never_merged():
+    queries = [
+        LONG_QUERY.format(duration=3, joint="knee", city="Pune"),
+        LONG_QUERY.format(duration=3, joint="hip", city="Pune"),
+        LONG_QUERY.format(duration=3, joint="knee", city="Mumbai"),
+        LONG_QUERY.format(duration=30, joint="knee", city="Pune"),
+    ]
+    assert group_similar_queries(queries) == [[0], [1], [2], [3]]
+
+
+@pytest.mark.parametrize("first, second", [
+    ("ages 25,30 knee surgery", "ages 2530 knee surgery"),
+    ("46 year old male knee surgery", "46 year old female knee surgery"),
+    ("46 year old male knee surgery", "47 year old male knee surgery"),
+    ("knee surgery for rs 50000", "knee surgery for rs 5000"),
+    ("dental treatment after accident", "dental treatment before accident"),
+    ("cataract surgery with 2 year policy", "cataract surgery with 2 month policy"),
+    ("knee surgery covered", "knee surgery not covered"),
+])
+def test_queries_differing_in_a_critical_token_are_not_merged(first, second):
+    assert group_similar_queries([first, second]) == [[0], [1]]
+
+
+@pytest.mark.parametrize("first, second", [
+    ("knee surgery in Pune", "knee surgery Pune"),
+    ("Is knee surgery covered?", "knee surgery"),
+    ("knee surgery", "knee surgery please"),
+])
+def test_queries_differing_only_in_filler_words_are_merged(first, second):
+    assert group_similar_queries([first, second]) == [[0, 1]]
@@ -0,0 +1,217 @@
+import { before, describe, test } from "node:test";
+import assert from "node:assert/strict";
+import { createRequire } from "module";
+import fs from "fs";
+import os from "os";
+import path from "path";
+import { sql } from "drizzle-orm";
+import { getTableConfig, type SQLiteColumn } from "drizzle-orm/sqlite-core";
+import { type InsertAnalysis } from "@shared/schema";
+import * as sqliteSchema from "@shared/sqliteSchema";
+import { openDatabase, type LocalDatabase } from "./db";
+import { SqliteStorage } from "./storage";
+
+// better-sqlite3 is an optional dependency; skip when its native build isn't available
+const require = createRequire(import.meta.url);
+let skip: string | false = false;
+try {
+  require("better-sqlite3");
+} catch {
+  skip = "better-sqlite3 is not installed";
+}
+
+const sleep = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
+
+async function seedClaim(storage: SqliteStorage, procedure = "knee surgery") {
+  const document = await storage.createDocument({
+    filename: "policy",
+    originalName: "policy.pdf",
+    fileSize: 1024,
+    filePath: "uploads/policy",
+    status: "uploaded",
+    sections: null,
+  });
+  const claim = await storage.createClaim({
+    documentId: document.id,
+    patientAge: 46,
+    gender: "male",
+    procedure,
+  });
+  return { document, claim };
+}
+
+function analysisFor(claimId: string, decision = "Yes"): InsertAnalysis {
+  return {
+    claimId,
+    decision,
+    approvedAmount: "₹50,000",
+    justification: "Covered under section 4",
+    relevantClauses: [{ title: "Section 4", text: "Surgery is covered", page_number: 3 }],
+    aiResponse: { choices: [{ message: { content: "{}" } }] },
+  };
+}
+
+describe("SqliteStorage", { skip }, () => {
+  test("createAnalyses writes batches larger than one chunk and counts every row", async () => {
+    const storage = new SqliteStorage(openDatabase(":memory:"));
+    const { document } = await seedClaim(storage);
+    const claimIds: string[] = [];
+    for (let i = 0; i < 120; i++) {
+      const claim = await storage.createClaim({ documentId: document.id, patientAge: 30, gender: "female", procedure: `query ${i}` });
+      claimIds.push(claim.id);
+    }
+
+    const created = await storage.createAnalyses(
+      Array.from({ length: 250 }, (_, i) => analysisFor(claimIds[i % claimIds.length], i % 2 ? "Yes" : "No"))
+    );
+
+    assert.equal(created.length, 250);
+    assert.equal((await storage.getAllAnalyses()).length, 250);
+    assert.equal(storage.analytics.getSummary().totalAnalyses, 250);
+    assert.equal(storage.analytics.getSummary().approvedClaims, 125);
+    assert.deepEqual(storage.analytics.getDocumentBreakdown().map(d => [d.documentId, d.totalAnalyses]), [[document.id, 250]]);
+  });
+
+  test("createAnalyses is all-or-nothing", async () => {
+    const storage = new SqliteStorage(openDatabase(":memory:"));
+    const { claim } = await seedClaim(storage);
+
+    // The unknown claim violates the foreign key and rolls back the whole batch
+    await assert.rejects(storage.createAnalyses([analysisFor(claim.id), analysisFor("missing-claim")]));
+    assert.equal((await storage.getAllAnalyses()).length, 0);
+    assert.equal(storage.analytics.getSummary().totalAnalyses, 0);
+  });
+
+  test("getRecentAnalyses returns the newest analyses up to the limit", async () => {
+    const storage = new SqliteStorage(openDatabase(":memory:"));
+    const { claim } = await seedClaim(storage);
+    const ids: string[] = [];
+    for (let i = 0; i < 5; i++) {
+      ids.push((await storage.createAnalysis(analysisFor(claim.id))).id);
+      await sleep(2);
+    }
+
+    const recent = await storage.getRecentAnalyses(3);
+    assert.deepEqual(recent.map(a => a.id), ids.slice(2).reverse());
+    assert.deepEqual((await storage.getAnalysesByClaim(claim.id)).map(a => a.id), [...ids].reverse());
+  });
+
+  test("JSON columns round-trip", async () => {
+    const storage = new SqliteStorage(openDatabase(":memory:"));
+    const { claim } = await seedClaim(storage);
+    const input = analysisFor(claim.id);
+    const { id } = await storage.createAnalysis(input);
+
+    const stored = await storage.getAnalysis(id);
+    assert.deepEqual(stored?.relevantClauses, input.relevantClauses);
+    assert.deepEqual(stored?.aiResponse, input.aiResponse);
+    assert.ok(stored?.createdAt instanceof Date);
+  });
+
+  test("updateDocument returns the updated row and persists sections", async () => {
+    const storage = new SqliteStorage(openDatabase(":memory:"));
+    const { document } = await seedClaim(storage);
+    const sections = [{ id: "s1", page_number: 1, title: "Coverage", text: "Hospitalisation is covered" }];
+    const processedAt = new Date();
+
+    const updated = await storage.updateDocument(document.id, { status: "processed", processedAt, sections });
+    assert.equal(updated?.status, "processed");
+    assert.equal(updated?.processedAt?.getTime(), processedAt.getTime());
+    assert.deepEqual(updated?.sections, sections);
+    assert.deepEqual(await storage.getDocument(document.id), updated);
+    assert.equal(await storage.updateDocument("missing", { status: "processed" }), undefined);
+  });
+
+  test("data and analytics survive reopening the same file", async () => {
+    const dir = fs.mkdtempSync(path.join(os.tmpdir(), "claims-db-"));
+    const file = path.join(dir, "claims.db");
+    try {
+      const first = new SqliteStorage(openDatabase(file));
+      const { document, claim } = await seedClaim(first);
+      const sections = [{ id: "s1", page_number: 2, title: "Exclusions", text: "Cosmetic surgery is excluded" }];
+      await first.updateDocument(document.id, { status: "processed", sections });
+      await first.createAnalyses([analysisFor(claim.id, "Yes"), analysisFor(claim.id, "No")]);
+
+      const reopened = new SqliteStorage(openDatabase(file));
+      assert.deepEqual((await reopened.getDocument(document.id))?.sections, sections);
+      assert.equal((await reopened.getClaimsByDocument(document.id)).length, 1);
+      assert.deepEqual(reopened.analytics.getSummary(), first.analytics.getSummary());
+    } finally {
+      fs.rmSync(dir, { recursive: true, force: true });
+    }
+  });
+});
+
+interface ColumnInfo { name: string; type: string; notnull: number; dflt_value: string | null; pk: number }
+interface IndexInfo { name: string; origin: string }
+interface ForeignKeyInfo { table: string; from: string; to: string }
+
+function pragma<T>(db: LocalDatabase, statement: string): T[] {
+  return db.all<T>(sql.raw(`PRAGMA ${statement}`));
+}
+
+function sqlDefault(column: SQLiteColumn): string | null {
+  if (column.default === undefined) return null;
+  return typeof column.default === "string" ? `'${column.default}'` : String(column.default);
+}
+
+// The bootstrap DDL in db.ts is written by hand; fail if it drifts from the drizzle tables
+describe("bootstrap DDL", { skip }, () => {
+  let db: LocalDatabase;
+  before(() => {
+    db = openDatabase(":memory:");
+  });
+
+  for (const table of [sqliteSchema.documents, sqliteSchema.claims, sqliteSchema.analyses]) {
+    const config = getTableConfig(table);
+
+    test(`${config.name} columns match the schema`, () => {
+      const actual = pragma<ColumnInfo>(db, `table_info(${config.name})`).map(column => ({
+        name: column.name,
+        type: column.type.toLowerCase(),
+        notNull: column.notnull === 1,
+        primary: column.pk > 0,
+        default: column.dflt_value,
+      }));
+      const expected = config.columns.map(column => ({
+        name: column.name,
+        type: column.getSQLType(),
+        notNull: column.notNull,
+        primary: column.primary,
+        default: sqlDefault(column),
+      }));
+      assert.deepEqual(actual, expected);
+    });
+
+    test(`${config.name} indexes match the schema`, () => {
+      const actual = pragma<IndexInfo>(db, `index_list(${config.name})`)
+        .filter(index => index.origin === "c")
+        .map(index => ({
+          name: index.name,
+          columns: pragma<{ name: string }>(db, `index_info(${index.name})`).map(column => column.name),
+        }))
+        .sort((a, b) => a.name.localeCompare(b.name));
+      const expected = config.indexes
+        .map(index => ({
+          name: index.config.name,
+          columns: index.config.columns.map(column => (column as SQLiteColumn).name),
+        }))
+        .sort((a, b) => a.name.localeCompare(b.name));
+      assert.deepEqual(actual, expected);
+    });
+
+    test(`${config.name} foreign keys match the schema`, () => {
+      const actual = pragma<ForeignKeyInfo>(db, `foreign_key_list(${config.name})`)
+        .map(fk => ({ table: fk.table, from: fk.from, to: fk.to }));
+      const expected = config.foreignKeys.map(fk => {
+        const reference = fk.reference();
+        return {
+          table: getTableConfig(reference.foreignTable).name,
+          from: reference.columns[0].name,
+          to: reference.foreignColumns[0].name,
+        };
+      });
+      assert.deepEqual(actual, expected);
+    });
+  }
+});
@@ -1,7 +1,27 @@
 import { type Document, type InsertDocument, type Claim, type InsertClaim, type Analysis, type InsertAnalysis } from "@shared/schema";
+import { analyses, claims, documents } from "@shared/sqliteSchema";
+import { desc, eq, inArray } from "drizzle-orm";
 import { randomUUID } from "crypto";
+import { openDatabase, type LocalDatabase } from "./db";
+import { AnalyticsAggregator } from "./analytics";
+
+// Rows or ids per statement. Analyses bind 8 columns per row, so this keeps both
+// inserts and IN (...) lookups far below SQLite's limit on bound variables (999 on
+// older builds).
+const SQLITE_CHUNK_SIZE = 100;
+
+function chunks<T>(items: T[], size: number = SQLITE_CHUNK_SIZE): T[][] {
+  const result: T[][] = [];
+  for (let start = 0; start < items.length; start += size) {
+    result.push(items.slice(start, start + size));
+  }
+  return result;
+}
 
 export interface IStorage {
+  // Decision counters kept up to date by createAnalysis/createAnalyses
+  analytics: AnalyticsAggregator;
+
   // Documents
   createDocument(document: InsertDocument): Promise<Document>;
   getDocument(id: string): Promise<Document | undefined>;
@@ -16,6 +36,8 @@ export interface IStorage {
   
   // Analyses
   createAnalysis(analysis: InsertAnalysis): Promise<Analysis>;
+  // All-or-nothing: if it rejects, none of the analyses were saved or counted
+  createAnalyses(analyses: InsertAnalysis[]): Promise<Analysis[]>;
   getAnalysis(id: string): Promise<Analysis | undefined>;
   getAnalysesByClaim(claimId: string): Promise<Analysis[]>;
   getAllAnalyses(): Promise<Analysis[]>;
@@ -26,6 +48,7 @@ export class MemStorage implements IStorage {
   private documents: Map<string, Document>;
   private claims: Map<string, Claim>;
   private analyses: Map<string, Analysis>;
+  readonly analytics = new AnalyticsAggregator();
 
   constructor() {
     this.documents = new Map();
@@ -102,17 +125,26 @@ export class MemStorage implements IStorage {
 
   // Analyses
   async createAnalysis(insertAnalysis: InsertAnalysis): Promise<Analysis> {
-    const id = randomUUID();
-    const analysis: Analysis = {
+    const [analysis] = await this.createAnalyses([insertAnalysis]);
+    return analysis;
+  }
+
+  async createAnalyses(insertAnalyses: InsertAnalysis[]): Promise<Analysis[]> {
+    // Build every row before touching the map so a failure leaves nothing half-written
+    const created: Analysis[] = insertAnalyses.map(insertAnalysis => ({
       ...insertAnalysis,
-      id,
+      id: randomUUID(),
       createdAt: new Date(),
       approvedAmount: insertAnalysis.approvedAmount || null,
       relevantClauses: insertAnalysis.relevantClauses || null,
       aiResponse: insertAnalysis.aiResponse || null,
-    };
-    this.analyses.set(id, analysis);
-    return analysis;
+    }));
+
+    for (const analysis of created) {
+      this.analyses.set(analysis.id, analysis);
+      this.analytics.record(analysis, this.claims.get(analysis.claimId)?.documentId);
+    }
+    return created;
   }
 
   async getAnalysis(id: string): Promise<Analysis | undefined> {
@@ -137,4 +169,159 @@ export class MemStorage implements IStorage {
   }
 }
 
-export const storage = new MemStorage();
+export class SqliteStorage implements IStorage {
+  readonly analytics = new AnalyticsAggregator();
+
+  constructor(private db: LocalDatabase) {
+    // Seed the counters from persisted history once; afterwards they are maintained on write
+    const history = this.db
+      .select({ decision: analyses.decision, createdAt: analyses.createdAt, documentId: claims.documentId })
+      .from(analyses)
+      .leftJoin(claims, eq(analyses.claimId, claims.id))
+      .all();
+    for (const row of history) {
+      this.analytics.record(row, row.documentId ?? undefined);
+    }
+  }
+
+  // Documents
+  async createDocument(insertDocument: InsertDocument): Promise<Document> {
+    const document: Document = {
+      ...insertDocument,
+      id: randomUUID(),
+      uploadedAt: new Date(),
+      processedAt: null,
+      status: insertDocument.status || "uploaded",
+      sections: insertDocument.sections || null,
+    };
+    this.db.insert(documents).values(document).run();
+    return document;
+  }
+
+  async getDocument(id: string): Promise<Document | undefined> {
+    return this.db.select().from(documents).where(eq(documents.id, id)).get();
+  }
+
+  async getAllDocuments(): Promise<Document[]> {
+    return this.db.select().from(documents).orderBy(desc(documents.uploadedAt)).all();
+  }
+
+  async updateDocument(id: string, updates: Partial<Document>): Promise<Document | undefined> {
+    const { id: _id, ...changes } = updates;
+    if (Object.keys(changes).length === 0) return this.getDocument(id);
+
+    return this.db.update(documents).set(changes).where(eq(documents.id, id)).returning().get();
+  }
+
+  // Claims
+  async createClaim(insertClaim: InsertClaim): Promise<Claim> {
+    const claim: Claim = {
+      ...insertClaim,
+      id: randomUUID(),
+      createdAt: new Date(),
+      location: insertClaim.location || null,
+      distance: insertClaim.distance || null,
+      policyDuration: insertClaim.policyDuration || null,
+      claimAmount: insertClaim.claimAmount || null,
+      reimbursementPercentage: insertClaim.reimbursementPercentage || null,
+    };
+    this.db.insert(claims).values(claim).run();
+    return claim;
+  }
+
+  async getClaim(id: string): Promise<Claim | undefined> {
+    return this.db.select().from(claims).where(eq(claims.id, id)).get();
+  }
+
+  async getClaimsByDocument(documentId: string): Promise<Claim[]> {
+    return this.db.select().from(claims)
+      .where(eq(claims.documentId, documentId))
+      .orderBy(desc(claims.createdAt))
+      .all();
+  }
+
+  async getAllClaims(): Promise<Claim[]> {
+    return this.db.select().from(claims).orderBy(desc(claims.createdAt)).all();
+  }
+
+  // Analyses
+  private buildAnalysis(insertAnalysis: InsertAnalysis): Analysis {
+    return {
+      ...insertAnalysis,
+      id: randomUUID(),
+      createdAt: new Date(),
+      approvedAmount: insertAnalysis.approvedAmount || null,
+      relevantClauses: insertAnalysis.relevantClauses || null,
+      aiResponse: insertAnalysis.aiResponse || null,
+    };
+  }
+
+  async createAnalysis(insertAnalysis: InsertAnalysis): Promise<Analysis> {
+    const [analysis] = await this.createAnalyses([insertAnalysis]);
+    return analysis;
+  }
+
+  async createAnalyses(insertAnalyses: InsertAnalysis[]): Promise<Analysis[]> {
+    if (insertAnalyses.length === 0) return [];
+
+    const rows = insertAnalyses.map(analysis => this.buildAnalysis(analysis));
+
+    // Resolve documents before writing, so nothing can fail once the rows are committed
+    const claimIds = Array.from(new Set(rows.map(row => row.claimId)));
+    const claimDocuments = new Map<string, string>();
+    for (const ids of chunks(claimIds)) {
+      const found = this.db.select({ id: claims.id, documentId: claims.documentId })
+        .from(claims)
+        .where(inArray(claims.id, ids))
+        .all();
+      for (const claim of found) claimDocuments.set(claim.id, claim.documentId);
+    }
+
+    // Chunked multi-row inserts inside one transaction, so bulk runs pay for one fsync
+    this.db.transaction((tx) => {
+      for (const batch of chunks(rows)) {
+        tx.insert(analyses).values(batch).run();
+      }
+    });
+
+    for (const row of rows) {
+      this.analytics.record(row, claimDocuments.get(row.claimId));
+    }
+    return rows;
+  }
+
+  async getAnalysis(id: string): Promise<Analysis | undefined> {
+    return this.db.select().from(analyses).where(eq(analyses.id, id)).get();
+  }
+
+  async getAnalysesByClaim(claimId: string): Promise<Analysis[]> {
+    return this.db.select().from(analyses)
+      .where(eq(analyses.claimId, claimId))
+      .orderBy(desc(analyses.createdAt))
+      .all();
+  }
+
+  async getAllAnalyses(): Promise<Analysis[]> {
+    return this.db.select().from(analyses).orderBy(desc(analyses.createdAt)).all();
+  }
+
+  async getRecentAnalyses(limit: number = 10): Promise<Analysis[]> {
+    return this.db.select().from(analyses).orderBy(desc(analyses.createdAt)).limit(limit).all();
+  }
+}
+
+// SQLite persistence is opt-in via SQLITE_PATH. Serverless platforms such as Vercel
+// have a read-only filesystem, so they always fall back to the in-memory store.
+function createStorage(): IStorage {
+  const sqlitePath = process.env.SQLITE_PATH;
+  if (!sqlitePath) return new MemStorage();
+
+  if (process.env.VERCEL) {
+    console.warn("SQLITE_PATH is ignored on Vercel (read-only filesystem); using in-memory storage");
+    return new MemStorage();
+  }
+
+  return new SqliteStorage(openDatabase(sqlitePath));
+}
+
+export const storage = createStorage();
@@ -1,5 +1,5 @@
 import { sql } from "drizzle-orm";
-import { pgTable, text, varchar, timestamp, integer, boolean, real, jsonb } from "drizzle-orm/pg-core";
+import { pgTable, text, varchar, timestamp, integer, boolean, real, jsonb, index } from "drizzle-orm/pg-core";
 import { createInsertSchema } from "drizzle-zod";
 import { z } from "zod";
 
@@ -13,7 +13,9 @@ export const documents = pgTable("documents", {
   processedAt: timestamp("processed_at"),
   status: text("status").default("uploaded").notNull(), // uploaded, processing, processed, error
   sections: jsonb("sections"), // extracted sections from PDF
-});
+}, (table) => [
+  index("documents_uploaded_at_idx").on(table.uploadedAt),
+]);
 
 export const claims = pgTable("claims", {
   id: varchar("id").primaryKey().default(sql`gen_random_uuid()`),
@@ -27,7 +29,10 @@ export const claims = pgTable("claims", {
   claimAmount: real("claim_amount"),
   reimbursementPercentage: integer("reimbursement_percentage").default(100),
   createdAt: timestamp("created_at").defaultNow().notNull(),
-});
+}, (table) => [
+  index("claims_document_id_created_at_idx").on(table.documentId, table.createdAt),
+  index("claims_created_at_idx").on(table.createdAt),
+]);
 
 export const analyses = pgTable("analyses", {
   id: varchar("id").primaryKey().default(sql`gen_random_uuid()`),
@@ -38,7 +43,10 @@ export const analyses = pgTable("analyses", {
   relevantClauses: jsonb("relevant_clauses"),
   aiResponse: jsonb("ai_response"),
   createdAt: timestamp("created_at").defaultNow().notNull(),
-});
+}, (table) => [
+  index("analyses_claim_id_created_at_idx").on(table.claimId, table.createdAt),
+  index("analyses_created_at_idx").on(table.createdAt),
+]);
 
 export const insertDocumentSchema = createInsertSchema(documents).omit({
   id: true,
@@ -0,0 +1,50 @@
+import { sqliteTable, text, integer, real, index } from "drizzle-orm/sqlite-core";
+
+// SQLite mirror of the tables in ./schema.ts, used by the embedded local backend.
+// Column names and nullability must stay in sync so rows map onto the same
+// Document / Claim / Analysis types.
+
+export const documents = sqliteTable("documents", {
+  id: text("id").primaryKey(),
+  filename: text("filename").notNull(),
+  originalName: text("original_name").notNull(),
+  fileSize: integer("file_size").notNull(),
+  filePath: text("file_path").notNull(),
+  uploadedAt: integer("uploaded_at", { mode: "timestamp_ms" }).notNull(),
+  processedAt: integer("processed_at", { mode: "timestamp_ms" }),
+  status: text("status").default("uploaded").notNull(), // uploaded, processing, processed, error
+  sections: text("sections", { mode: "json" }), // extracted sections from PDF
+}, (table) => [
+  index("documents_uploaded_at_idx").on(table.uploadedAt),
+]);
+
+export const claims = sqliteTable("claims", {
+  id: text("id").primaryKey(),
+  documentId: text("document_id").references(() => documents.id).notNull(),
+  patientAge: integer("patient_age").notNull(),
+  gender: text("gender").notNull(),
+  procedure: text("procedure").notNull(),
+  location: text("location"),
+  distance: real("distance"),
+  policyDuration: integer("policy_duration"),
+  claimAmount: real("claim_amount"),
+  reimbursementPercentage: integer("reimbursement_percentage").default(100),
+  createdAt: integer("created_at", { mode: "timestamp_ms" }).notNull(),
+}, (table) => [
+  index("claims_document_id_created_at_idx").on(table.documentId, table.createdAt),
+  index("claims_created_at_idx").on(table.createdAt),
+]);
+
+export const analyses = sqliteTable("analyses", {
+  id: text("id").primaryKey(),
+  claimId: text("claim_id").references(() => claims.id).notNull(),
+  decision: text("decision").notNull(), // Yes/No/Partial
+  approvedAmount: text("approved_amount"),
+  justification: text("justification").notNull(),
+  relevantClauses: text("relevant_clauses", { mode: "json" }),
+  aiResponse: text("ai_response", { mode: "json" }),
+  createdAt: integer("created_at", { mode: "timestamp_ms" }).notNull(),
+}, (table) => [
+  index("analyses_claim_id_created_at_idx").on(table.claimId, table.createdAt),
+  index("analyses_created_at_idx").on(table.createdAt),
+]);